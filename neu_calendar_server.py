@@ -3,73 +3,347 @@ import os
 import json
 import datetime
 import httpx
-from icalendar import Calendar
 from typing import List, Dict, Any, Optional, Union
+from dataclasses import dataclass
+import atexit
+import asyncio
+from bisect import bisect_left, bisect_right
+import logging
+import random
 import textwrap
-import sys
+import time
 import re
 
 # Create an MCP server
 mcp = FastMCP("NEU Calendar Service")
 
+# Per-event parse glitches are logged at DEBUG so a malformed feed with
+# thousands of minor errors doesn't hammer stderr on the hot parse path
+log = logging.getLogger("neu_calendar")
+log.setLevel(logging.WARNING)
+
 # URL for the Northeastern University calendar ICS file
 CALENDAR_URL = "https://calendar.northeastern.edu/search/events.ics"
 
+# Base cache TTL; each refresh re-draws the actual duration with +/-10%
+# jitter so multiple instances don't refresh in lockstep
+CACHE_TTL_SECONDS = 3600
+
+def _jittered_ttl():
+    """Return the cache duration with +/-10% jitter applied."""
+    return datetime.timedelta(seconds=CACHE_TTL_SECONDS * random.uniform(0.9, 1.1))
+
 # Cache for the calendar data to avoid fetching it too often
 calendar_cache = {
     "last_fetch": None,
     "data": None,
-    "cache_duration": datetime.timedelta(hours=1)  # Cache for 1 hour
+    "cache_duration": _jittered_ttl(),  # Cache for ~1 hour
+    "etag": None,  # Validators from the last 200 response, used for
+    "last_modified": None,  # conditional GETs on refresh
+    "by_date": {},  # start_date string -> list of events on that date
+    "by_category": {},  # lowercased category -> list of events
+    "ordinals": []  # start_ordinal of each event, parallel to the sorted list
 }
 
-async def fetch_calendar_data():
+# The ICS feed is highly compressible plain text, so advertise every
+# encoding we can actually decode; brotli needs an optional decoder
+try:
+    import brotli  # noqa: F401
+    _ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    _ACCEPT_ENCODING = "gzip, deflate"
+
+# Shared HTTP client so cache refreshes reuse the same connection pool
+# (keeps TCP/TLS to calendar.northeastern.edu alive between fetches)
+_http = httpx.AsyncClient(timeout=10.0, headers={"Accept-Encoding": _ACCEPT_ENCODING})
+
+def _close_http_client():
+    """Close the shared HTTP client on interpreter shutdown."""
+    try:
+        asyncio.run(_http.aclose())
+    except Exception:
+        pass
+
+atexit.register(_close_http_client)
+
+# Patterns used on every event during extraction, compiled once
+_GEO_RE = re.compile(r'[-+]?\d*\.\d+|\d+')
+_CATEGORY_SPLIT_RE = re.compile(r"(?<!\\),")
+
+# Sort/filter sentinel for events with no start date; larger than any
+# real date ordinal so undated events sort last
+_NO_DATE_ORDINAL = 10**9
+
+@dataclass(slots=True)
+class Event:
     """
-    Fetch the calendar data from the Northeastern University calendar.
-    Uses caching to avoid fetching the data too often.
+    A parsed calendar event. Slotted so the cached list stores compact
+    objects with C-level attribute access instead of per-event dicts.
+    The underscore fields are precomputed helpers for sorting, search
+    and category matching.
     """
-    now = datetime.datetime.now()
-    
-    # Check if we need to refresh the cache
-    if (calendar_cache["last_fetch"] is None or 
-        calendar_cache["data"] is None or 
-        now - calendar_cache["last_fetch"] > calendar_cache["cache_duration"]):
-        
+    summary: str
+    start_date: Optional[str]
+    start_ordinal: int
+    start_weekday: Optional[str]
+    start_time: Optional[str]
+    end_date: Optional[str]
+    end_time: Optional[str]
+    location: str
+    description: str
+    url: str
+    geo: Optional[Dict[str, float]]
+    categories: List[str]
+    _categories_lc: tuple
+    _search_blob: str
+    _short_block: str
+
+def _unfold_lines(text):
+    """
+    Yield logical ICS lines with folded continuations joined back together.
+    Per RFC 5545 section 3.1, a line starting with a space or tab continues
+    the previous line.
+    """
+    pending = None
+    for line in text.splitlines():
+        if line[:1] in (" ", "\t"):
+            if pending is not None:
+                pending += line[1:]
+            continue
+        if pending is not None:
+            yield pending
+        pending = line
+    if pending is not None:
+        yield pending
+
+def parse_ics_stream(text):
+    """
+    Parse the VEVENT components out of raw ICS text.
+
+    This is a line-oriented replacement for building a full icalendar
+    component tree: it tracks BEGIN:VEVENT/END:VEVENT state and collects
+    each event's properties into a plain dict mapping the property name to
+    a (params, value) tuple. Properties that appear more than once in an
+    event (e.g. CATEGORIES) are accumulated into a list of tuples.
+    """
+    events = []
+    props = None
+
+    for line in _unfold_lines(text):
+        if props is None:
+            if line == "BEGIN:VEVENT":
+                props = {}
+            continue
+
+        if line == "END:VEVENT":
+            events.append(props)
+            props = None
+            continue
+
+        name_part, sep, value = line.partition(":")
+        if not sep:
+            continue
+
+        name, _, param_str = name_part.partition(";")
+        name = name.upper()
+
+        params = {}
+        if param_str:
+            for param in param_str.split(";"):
+                param_name, _, param_value = param.partition("=")
+                params[param_name.upper()] = param_value.strip('"')
+
+        existing = props.get(name)
+        if existing is None:
+            props[name] = (params, value)
+        elif isinstance(existing, list):
+            existing.append((params, value))
+        else:
+            props[name] = [existing, (params, value)]
+
+    return events
+
+def _unescape_text(value):
+    """
+    Undo RFC 5545 text escaping (\\n, \\, \\; and \\\\).
+    """
+    if "\\" not in value:
+        return value
+    return (value.replace("\\n", "\n").replace("\\N", "\n")
+                 .replace("\\,", ",").replace("\\;", ";")
+                 .replace("\\\\", "\\"))
+
+def _parse_ics_datetime(value):
+    """
+    Parse a DTSTART/DTEND value in its fixed RFC 5545 formats:
+    YYYYMMDD for dates, YYYYMMDDTHHMMSS with an optional trailing Z for
+    date-times. Returns a date or datetime accordingly.
+    """
+    value = value.strip()
+    if value.endswith("Z"):
+        value = value[:-1]
+    if len(value) == 8:
+        return datetime.datetime.strptime(value, "%Y%m%d").date()
+    return datetime.datetime.strptime(value, "%Y%m%dT%H%M%S")
+
+def _prop_value(props, name, default=""):
+    """
+    Return the raw value string of a property from a parsed event dict,
+    taking the first occurrence if the property was repeated.
+    """
+    entry = props.get(name)
+    if entry is None:
+        return default
+    if isinstance(entry, list):
+        entry = entry[0]
+    return entry[1]
+
+# How long expired data may still be served while a background refresh
+# runs; beyond this the fetch becomes blocking again
+STALE_MAX = datetime.timedelta(hours=24)
+
+# Single-flight guard: when the cache expires under concurrent tool
+# calls, only one coroutine fetches and parses; the rest await it
+_refresh_lock = asyncio.Lock()
+
+# Reference to the in-flight background refresh task, kept so it isn't
+# garbage-collected mid-flight
+_background_refresh = None
+
+def _cache_is_fresh(now):
+    """
+    Return True if the cached event list exists and is within its TTL.
+    """
+    return (calendar_cache["last_fetch"] is not None and
+            calendar_cache["data"] is not None and
+            now - calendar_cache["last_fetch"] <= calendar_cache["cache_duration"])
+
+async def _refresh_calendar_data():
+    """
+    Fetch and parse the calendar feed, updating the cache. Serialized
+    behind the single-flight lock; returns the current event list.
+    """
+    async with _refresh_lock:
+        # Re-check after acquiring the lock: another coroutine may have
+        # refreshed the cache while we were waiting
+        now = datetime.datetime.now()
+        if _cache_is_fresh(now):
+            return calendar_cache["data"]
+
         try:
-            print(f"Fetching calendar data from {CALENDAR_URL}", file=sys.stderr)
-            async with httpx.AsyncClient() as client:
-                response = await client.get(CALENDAR_URL)
-                response.raise_for_status()
-                
-                # Parse the ICS data
-                cal = Calendar.from_ical(response.text)
-                
-                # Update the cache
+            log.info("Fetching calendar data from %s", CALENDAR_URL)
+
+            # Send validators from the previous response so an unchanged
+            # feed comes back as a bodyless 304 instead of a full re-parse
+            headers = {}
+            if calendar_cache["data"] is not None:
+                if calendar_cache["etag"]:
+                    headers["If-None-Match"] = calendar_cache["etag"]
+                if calendar_cache["last_modified"]:
+                    headers["If-Modified-Since"] = calendar_cache["last_modified"]
+
+            response = await _http.get(CALENDAR_URL, headers=headers)
+
+            if response.status_code == 304:
+                # Feed unchanged; keep the parsed events and reset the TTL
                 calendar_cache["last_fetch"] = now
-                calendar_cache["data"] = cal
-                
-                return cal
+                calendar_cache["cache_duration"] = _jittered_ttl()
+                return calendar_cache["data"]
+
+            response.raise_for_status()
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+
+            # Parse the ICS data once, timing it so parse regressions on
+            # big feeds show up at DEBUG
+            parse_start = time.perf_counter()
+            raw_events = parse_ics_stream(response.text)
+
+            # Free the multi-megabyte response body; only the small event
+            # objects need to outlive the parse
+            del response
+
+            if len(raw_events) > 500:
+                # Big cold parse: run extraction in the default thread pool
+                # so the event loop keeps serving other coroutines
+                loop = asyncio.get_running_loop()
+                events = await loop.run_in_executor(
+                    None, lambda: list(map(extract_event_details, raw_events)))
+            else:
+                events = [extract_event_details(props) for props in raw_events]
+
+            log.debug("Parsed and extracted %d events in %.1f ms",
+                      len(events), (time.perf_counter() - parse_start) * 1000)
+
+            # Sort by start date (undated events sort last via the sentinel)
+            events.sort(key=lambda x: x.start_ordinal)
+
+            # Build lookup indexes once so the tools can answer exact
+            # date/category queries without scanning every event
+            by_date = {}
+            by_category = {}
+            for event in events:
+                if event.start_date:
+                    by_date.setdefault(event.start_date, []).append(event)
+                for cat in event._categories_lc:
+                    by_category.setdefault(cat, []).append(event)
+
+            # Update the cache
+            calendar_cache["last_fetch"] = now
+            calendar_cache["cache_duration"] = _jittered_ttl()
+            calendar_cache["data"] = events
+            calendar_cache["by_date"] = by_date
+            calendar_cache["by_category"] = by_category
+            calendar_cache["ordinals"] = [event.start_ordinal for event in events]
+            calendar_cache["etag"] = etag
+            calendar_cache["last_modified"] = last_modified
+
+            return events
         except Exception as e:
-            print(f"Error fetching calendar data: {str(e)}", file=sys.stderr)
+            log.warning("Error fetching calendar data: %s", e)
             if calendar_cache["data"] is not None:
                 # Return cached data if available, even if it's stale
-                print("Using stale cached data", file=sys.stderr)
+                log.warning("Using stale cached data")
                 return calendar_cache["data"]
             raise Exception(f"Failed to fetch calendar data: {str(e)}")
-    
-    return calendar_cache["data"]
 
-def extract_event_details(component):
+async def fetch_calendar_data():
+    """
+    Return the cached event list, refreshing it as needed. Fresh data is
+    returned directly. Expired-but-recent data is returned immediately
+    while a background task revalidates it (stale-while-revalidate), so
+    tool calls almost never block on the network. Only a cold or very
+    stale cache awaits the full fetch and parse.
+    """
+    global _background_refresh
+    now = datetime.datetime.now()
+
+    if _cache_is_fresh(now):
+        return calendar_cache["data"]
+
+    if (calendar_cache["data"] is not None and
+        calendar_cache["last_fetch"] is not None and
+        now - calendar_cache["last_fetch"] <= STALE_MAX):
+        # Serve stale data immediately; kick off a refresh unless one is
+        # already running
+        if not _refresh_lock.locked():
+            _background_refresh = asyncio.create_task(_refresh_calendar_data())
+        return calendar_cache["data"]
+
+    return await _refresh_calendar_data()
+
+def extract_event_details(props):
     """
-    Extract details from an iCalendar event component.
+    Extract details from a parsed VEVENT property dict.
     """
     try:
-        event_summary = str(component.get("SUMMARY", ""))
-        
+        event_summary = _unescape_text(_prop_value(props, "SUMMARY"))
+
         # Handle start date/time with better error handling
         try:
-            event_start = component.get("DTSTART")
-            if event_start:
-                event_start = event_start.dt
+            event_start_value = _prop_value(props, "DTSTART", None)
+            if event_start_value:
+                event_start = _parse_ics_datetime(event_start_value)
                 # Convert to date if it's a datetime
                 if isinstance(event_start, datetime.datetime):
                     event_start_date = event_start.date()
@@ -81,15 +355,15 @@ def extract_event_details(component):
                 event_start_date = None
                 event_start_time = None
         except Exception as e:
-            print(f"Error parsing start date for event '{event_summary}': {str(e)}", file=sys.stderr)
+            log.debug("Error parsing start date for event '%s': %s", event_summary, e)
             event_start_date = None
             event_start_time = None
-        
+
         # Handle end date/time with better error handling
         try:
-            event_end = component.get("DTEND")
-            if event_end:
-                event_end = event_end.dt
+            event_end_value = _prop_value(props, "DTEND", None)
+            if event_end_value:
+                event_end = _parse_ics_datetime(event_end_value)
                 # Convert to date if it's a datetime
                 if isinstance(event_end, datetime.datetime):
                     event_end_date = event_end.date()
@@ -101,131 +375,126 @@ def extract_event_details(component):
                 event_end_date = None
                 event_end_time = None
         except Exception as e:
-            print(f"Error parsing end date for event '{event_summary}': {str(e)}", file=sys.stderr)
+            log.debug("Error parsing end date for event '%s': %s", event_summary, e)
             event_end_date = None
             event_end_time = None
-        
+
         # Extract other details with robust error handling
         try:
-            event_location = str(component.get("LOCATION", ""))
+            event_location = _unescape_text(_prop_value(props, "LOCATION"))
         except Exception:
             event_location = ""
-            
+
         try:
-            event_description = str(component.get("DESCRIPTION", ""))
+            event_description = _unescape_text(_prop_value(props, "DESCRIPTION"))
         except Exception:
             event_description = ""
-            
+
         try:
-            event_url = str(component.get("URL", ""))
+            event_url = _prop_value(props, "URL")
         except Exception:
             event_url = ""
-        
-        # Fix geo location handling with multiple formats
+
+        # Geo location handling for the formats the feed uses
         geo_data = None
         try:
-            geo = component.get("GEO")
+            geo = _prop_value(props, "GEO", None)
             if geo:
-                # For vGeo objects, try to use the latitude and longitude attributes
-                if hasattr(geo, 'latitude') and hasattr(geo, 'longitude'):
-                    geo_data = {"latitude": float(geo.latitude), "longitude": float(geo.longitude)}
-                # For tuple-like objects, try to unpack
-                elif hasattr(geo, '__iter__') and len(geo) >= 2:
-                    latitude, longitude = geo[0], geo[1]
-                    geo_data = {"latitude": float(latitude), "longitude": float(longitude)}
-                # For string representations with semicolons
-                elif isinstance(geo, str) and ';' in geo:
-                    parts = geo.split(';')
-                    if len(parts) >= 2:
-                        geo_data = {"latitude": float(parts[0]), "longitude": float(parts[1])}
+                # The normal GEO format is "latitude;longitude" - straight
+                # partition and float, no regex needed
+                lat_s, sep, lon_s = geo.partition(';')
+                if sep:
+                    geo_data = {"latitude": float(lat_s), "longitude": float(lon_s)}
                 # For other string representations, try to extract numbers
-                elif isinstance(geo, str):
-                    numbers = re.findall(r'[-+]?\d*\.\d+|\d+', geo)
+                else:
+                    numbers = _GEO_RE.findall(geo)
                     if len(numbers) >= 2:
                         geo_data = {"latitude": float(numbers[0]), "longitude": float(numbers[1])}
         except Exception as e:
-            print(f"Error parsing geo data for event '{event_summary}': {str(e)}", file=sys.stderr)
+            log.debug("Error parsing geo data for event '%s': %s", event_summary, e)
             geo_data = None
-        
-        # Extract categories with better handling of various formats
+
+        # Extract categories, accumulating repeated CATEGORIES properties
         categories = []
         try:
-            raw_categories = component.get("CATEGORIES")
+            raw_categories = props.get("CATEGORIES")
             if raw_categories:
-                # Handle different formats of categories
-                if isinstance(raw_categories, list):
-                    # Some ICS files store categories as list
-                    for cat_item in raw_categories:
-                        if isinstance(cat_item, str):
-                            categories.extend([c.strip() for c in cat_item.split(',') if c.strip()])
-                        elif hasattr(cat_item, 'cats'): 
-                            # Some icalendar implementations use a custom object
-                            categories.extend([c.strip() for c in cat_item.cats if c.strip()])
-                # Try to decode if it's in binary format
-                elif isinstance(raw_categories, bytes):
-                    try:
-                        decoded = raw_categories.decode("utf-8")
-                        categories = [cat.strip() for cat in decoded.split(",") if cat.strip()]
-                    except:
-                        categories = [cat.strip() for cat in str(raw_categories).split(",") if cat.strip()]
-                # Handle string formats
-                elif isinstance(raw_categories, str):
-                    categories = [cat.strip() for cat in raw_categories.split(",") if cat.strip()]
-                # Other object with direct attribute access
-                elif hasattr(raw_categories, 'cats'):
-                    categories = [cat.strip() for cat in raw_categories.cats if cat.strip()]
+                if not isinstance(raw_categories, list):
+                    raw_categories = [raw_categories]
+                for _params, value in raw_categories:
+                    # Split on unescaped commas before undoing escaping
+                    categories.extend(
+                        _unescape_text(cat).strip()
+                        for cat in _CATEGORY_SPLIT_RE.split(value)
+                        if cat.strip()
+                    )
         except Exception as e:
-            print(f"Error parsing categories for event '{event_summary}': {str(e)}", file=sys.stderr)
+            log.debug("Error parsing categories for event '%s': %s", event_summary, e)
             categories = []
-        
+
         # Create the event details dictionary
-        event_details = {
-            "summary": event_summary,
-            "start_date": event_start_date.strftime("%Y-%m-%d") if event_start_date else None,
-            "start_time": event_start_time,
-            "end_date": event_end_date.strftime("%Y-%m-%d") if event_end_date else None,
-            "end_time": event_end_time,
-            "location": event_location,
-            "description": event_description,
-            "url": event_url,
-            "geo": geo_data,
-            "categories": categories
-        }
-        
-        return event_details
+        # Pre-render the one-line listing block shared by the today/
+        # upcoming/category tools, so queries only prepend a bullet/index
+        time_str = f" at {event_start_time}" if event_start_time else ""
+        location_str = f"\n  Location: {event_location}" if event_location else ""
+        short_block = (
+            f"{event_summary}{time_str}{location_str}\n"
+            f"  URL: {event_url}\n\n"
+        )
+
+        return Event(
+            summary=event_summary,
+            start_date=event_start_date.strftime("%Y-%m-%d") if event_start_date else None,
+            start_ordinal=event_start_date.toordinal() if event_start_date else _NO_DATE_ORDINAL,
+            start_weekday=event_start_date.strftime("%A") if event_start_date else None,
+            start_time=event_start_time,
+            end_date=event_end_date.strftime("%Y-%m-%d") if event_end_date else None,
+            end_time=event_end_time,
+            location=event_location,
+            description=event_description,
+            url=event_url,
+            geo=geo_data,
+            categories=categories,
+            _categories_lc=tuple(cat.lower() for cat in categories),
+            _search_blob=(event_summary + "\x00" + event_description).lower(),
+            _short_block=short_block
+        )
     except Exception as e:
         # Catch any other unexpected errors
-        print(f"Unexpected error parsing event: {str(e)}", file=sys.stderr)
+        log.debug("Unexpected error parsing event: %s", e)
         # Return a minimal event with the summary if available
-        return {
-            "summary": str(component.get("SUMMARY", "Unknown Event")),
-            "start_date": None,
-            "start_time": None,
-            "end_date": None,
-            "end_time": None,
-            "location": "",
-            "description": "",
-            "url": "",
-            "geo": None,
-            "categories": []
-        }
+        summary = _prop_value(props, "SUMMARY", "Unknown Event")
+        return Event(
+            summary=summary,
+            start_date=None,
+            start_ordinal=_NO_DATE_ORDINAL,
+            start_weekday=None,
+            start_time=None,
+            end_date=None,
+            end_time=None,
+            location="",
+            description="",
+            url="",
+            geo=None,
+            categories=[],
+            _categories_lc=(),
+            _search_blob=summary.lower(),
+            _short_block=f"{summary}\n  URL: \n\n"
+        )
+
+def _today_key():
+    """
+    Return today's ("YYYY-MM-DD" string, ordinal) pair. Computed once per
+    tool invocation so filters and headers don't reformat date.today().
+    """
+    today = datetime.date.today()
+    return today.strftime("%Y-%m-%d"), today.toordinal()
 
 async def get_all_events():
     """
-    Get all events from the calendar.
+    Get all events from the calendar as a sorted list of Event objects.
     """
-    cal = await fetch_calendar_data()
-    events = []
-    
-    for component in cal.walk():
-        if component.name == "VEVENT":
-            event_details = extract_event_details(component)
-            events.append(event_details)
-    
-    # Sort by start date
-    events.sort(key=lambda x: x["start_date"] if x["start_date"] else "9999-12-31")
-    
-    return events
+    return await fetch_calendar_data()
 
 @mcp.tool()
 async def get_today_events() -> str:
@@ -236,28 +505,20 @@ async def get_today_events() -> str:
         A formatted string containing details of today's events
     """
     try:
-        all_events = await get_all_events()
-        today = datetime.date.today().strftime("%Y-%m-%d")
-        
-        today_events = [
-            event for event in all_events 
-            if event["start_date"] == today
-        ]
-        
+        await get_all_events()
+        today, _ = _today_key()
+
+        # Exact-date lookup against the cached index
+        today_events = calendar_cache["by_date"].get(today, [])
+
         if not today_events:
             return "No events scheduled for today."
         
-        result = f"Events for today ({today}):\n\n"
+        parts = [f"Events for today ({today}):\n\n"]
         for i, event in enumerate(today_events, 1):
-            time_str = f" at {event['start_time']}" if event['start_time'] else ""
-            location_str = f"\nLocation: {event['location']}" if event['location'] else ""
-            
-            result += (
-                f"{i}. {event['summary']}{time_str}{location_str}\n"
-                f"   URL: {event['url']}\n\n"
-            )
-        
-        return result
+            parts.append(f"{i}. {event._short_block}")
+
+        return "".join(parts)
     
     except Exception as e:
         return f"Error retrieving today's events: {str(e)}"
@@ -275,47 +536,38 @@ async def get_upcoming_events(days: int = 7) -> str:
     """
     try:
         all_events = await get_all_events()
-        today = datetime.date.today()
-        end_date = today + datetime.timedelta(days=days)
-        
-        today_str = today.strftime("%Y-%m-%d")
-        end_date_str = end_date.strftime("%Y-%m-%d")
-        
-        upcoming_events = [
-            event for event in all_events 
-            if event["start_date"] and today_str <= event["start_date"] <= end_date_str
-        ]
+        _, today_ord = _today_key()
+        end_ord = today_ord + days
+
+        # The cached list is sorted by ordinal, so bisect straight to the
+        # date window instead of scanning every event
+        ordinals = calendar_cache["ordinals"]
+        upcoming_events = all_events[bisect_left(ordinals, today_ord):bisect_right(ordinals, end_ord)]
         
         if not upcoming_events:
             return f"No events scheduled for the next {days} days."
         
-        result = f"Upcoming events for the next {days} days:\n\n"
-        
+        parts = [f"Upcoming events for the next {days} days:\n\n"]
+
         # Group events by date
         events_by_date = {}
         for event in upcoming_events:
-            date = event["start_date"]
+            date = event.start_date
             if date not in events_by_date:
                 events_by_date[date] = []
             events_by_date[date].append(event)
-        
-        # Sort dates and display events
+
+        # Sort dates and display events; the weekday name was computed at
+        # parse time, so no date string re-parsing here
         for date in sorted(events_by_date.keys()):
-            date_obj = datetime.datetime.strptime(date, "%Y-%m-%d").date()
-            day_name = date_obj.strftime("%A")
-            result += f"--- {day_name}, {date} ---\n"
-            
+            day_name = events_by_date[date][0].start_weekday
+            parts.append(f"--- {day_name}, {date} ---\n")
+
             for event in events_by_date[date]:
-                time_str = f" at {event['start_time']}" if event['start_time'] else ""
-                location_str = f"\n   Location: {event['location']}" if event['location'] else ""
-                
-                result += (
-                    f"* {event['summary']}{time_str}{location_str}\n"
-                    f"  URL: {event['url']}\n\n"
-                )
-        
-        return result
-    
+                parts.append(f"* {event._short_block}")
+
+        return "".join(parts)
+
     except Exception as e:
         return f"Error retrieving upcoming events: {str(e)}"
 
@@ -333,36 +585,35 @@ async def search_events(query: str, days: int = 30) -> str:
     """
     try:
         all_events = await get_all_events()
-        today = datetime.date.today()
-        end_date = today + datetime.timedelta(days=days)
-        
-        today_str = today.strftime("%Y-%m-%d")
-        end_date_str = end_date.strftime("%Y-%m-%d")
-        
-        # Filter events by date range and query
+        _, today_ord = _today_key()
+        end_ord = today_ord + days
+
+        # Bisect to the date window, then apply the query filter to it
+        ordinals = calendar_cache["ordinals"]
+        window = all_events[bisect_left(ordinals, today_ord):bisect_right(ordinals, end_ord)]
+
         query = query.lower()
         matching_events = [
-            event for event in all_events 
-            if (event["start_date"] and today_str <= event["start_date"] <= end_date_str) and
-               (query in event["summary"].lower() or query in event["description"].lower())
+            event for event in window
+            if query in event._search_blob
         ]
         
         if not matching_events:
             return f"No events matching '{query}' found in the next {days} days."
         
-        result = f"Events matching '{query}' in the next {days} days:\n\n"
-        
+        parts = [f"Events matching '{query}' in the next {days} days:\n\n"]
+
         for i, event in enumerate(matching_events, 1):
-            date_str = event["start_date"] if event["start_date"] else "No date"
-            time_str = f" at {event['start_time']}" if event['start_time'] else ""
-            location_str = f"\nLocation: {event['location']}" if event['location'] else ""
-            
-            result += (
-                f"{i}. {event['summary']} ({date_str}{time_str}){location_str}\n"
-                f"   URL: {event['url']}\n\n"
+            date_str = event.start_date if event.start_date else "No date"
+            time_str = f" at {event.start_time}" if event.start_time else ""
+            location_str = f"\nLocation: {event.location}" if event.location else ""
+
+            parts.append(
+                f"{i}. {event.summary} ({date_str}{time_str}){location_str}\n"
+                f"   URL: {event.url}\n\n"
             )
-        
-        return result
+
+        return "".join(parts)
     
     except Exception as e:
         return f"Error searching events: {str(e)}"
@@ -380,51 +631,56 @@ async def get_events_by_category(category: str, days: int = 30) -> str:
         A formatted string containing events in the specified category
     """
     try:
-        all_events = await get_all_events()
-        today = datetime.date.today()
-        end_date = today + datetime.timedelta(days=days)
-        
-        today_str = today.strftime("%Y-%m-%d")
-        end_date_str = end_date.strftime("%Y-%m-%d")
-        
-        # Filter events by date range and category
+        await get_all_events()
+        _, today_ord = _today_key()
+        end_ord = today_ord + days
+
+        # Look up candidates in the cached category index; exact matches
+        # are a single dict hit, otherwise fall back to substring matching
+        # over the category names
         category = category.lower()
+        by_category = calendar_cache["by_category"]
+        candidates = by_category.get(category)
+        if candidates is None:
+            candidates = []
+            seen = set()
+            for name, cat_events in by_category.items():
+                if category in name:
+                    for event in cat_events:
+                        if id(event) not in seen:
+                            seen.add(id(event))
+                            candidates.append(event)
+            candidates.sort(key=lambda x: x.start_ordinal)
+
+        # Filter the candidates by date range (integer ordinal compare)
         category_events = [
-            event for event in all_events 
-            if (event["start_date"] and today_str <= event["start_date"] <= end_date_str) and
-               any(category in cat.lower() for cat in event["categories"])
+            event for event in candidates
+            if today_ord <= event.start_ordinal <= end_ord
         ]
-        
+
         if not category_events:
             return f"No events in category '{category}' found in the next {days} days."
         
-        result = f"Events in category '{category}' for the next {days} days:\n\n"
-        
+        parts = [f"Events in category '{category}' for the next {days} days:\n\n"]
+
         # Group events by date
         events_by_date = {}
         for event in category_events:
-            date = event["start_date"]
+            date = event.start_date
             if date not in events_by_date:
                 events_by_date[date] = []
             events_by_date[date].append(event)
-        
-        # Sort dates and display events
+
+        # Sort dates and display events, reusing the precomputed weekday
         for date in sorted(events_by_date.keys()):
-            date_obj = datetime.datetime.strptime(date, "%Y-%m-%d").date()
-            day_name = date_obj.strftime("%A")
-            result += f"--- {day_name}, {date} ---\n"
-            
+            day_name = events_by_date[date][0].start_weekday
+            parts.append(f"--- {day_name}, {date} ---\n")
+
             for event in events_by_date[date]:
-                time_str = f" at {event['start_time']}" if event['start_time'] else ""
-                location_str = f"\n   Location: {event['location']}" if event['location'] else ""
-                
-                result += (
-                    f"* {event['summary']}{time_str}{location_str}\n"
-                    f"  URL: {event['url']}\n\n"
-                )
-        
-        return result
-    
+                parts.append(f"* {event._short_block}")
+
+        return "".join(parts)
+
     except Exception as e:
         return f"Error retrieving events by category: {str(e)}"
 
@@ -446,38 +702,38 @@ async def get_event_details(event_name: str) -> str:
         # Find events that match the name
         matching_events = [
             event for event in all_events 
-            if event_name_lower in event["summary"].lower()
+            if event_name_lower in event.summary.lower()
         ]
         
         if not matching_events:
             return f"No events found matching '{event_name}'."
         
         # If multiple events match, return information for all of them
-        result = f"Details for events matching '{event_name}':\n\n"
-        
+        parts = [f"Details for events matching '{event_name}':\n\n"]
+
         for i, event in enumerate(matching_events, 1):
-            date_str = event["start_date"] if event["start_date"] else "No date"
-            start_time = f" at {event['start_time']}" if event['start_time'] else ""
-            end_time = f" to {event['end_time']}" if event['end_time'] else ""
-            location = f"Location: {event['location']}\n" if event['location'] else ""
-            categories = f"Categories: {', '.join(event['categories'])}\n" if event['categories'] else ""
-            geo = f"Coordinates: {event['geo']['latitude']}, {event['geo']['longitude']}\n" if event['geo'] else ""
+            date_str = event.start_date if event.start_date else "No date"
+            start_time = f" at {event.start_time}" if event.start_time else ""
+            end_time = f" to {event.end_time}" if event.end_time else ""
+            location = f"Location: {event.location}\n" if event.location else ""
+            categories = f"Categories: {', '.join(event.categories)}\n" if event.categories else ""
+            geo = f"Coordinates: {event.geo['latitude']}, {event.geo['longitude']}\n" if event.geo else ""
             
             # Clean up description text
-            description = event["description"].replace("\\n", "\n").replace("\\,", ",")
+            description = event.description.replace("\\n", "\n").replace("\\,", ",")
             
-            result += (
-                f"--- Event {i}: {event['summary']} ---\n"
+            parts.append(
+                f"--- Event {i}: {event.summary} ---\n"
                 f"Date: {date_str}{start_time}{end_time}\n"
                 f"{location}"
                 f"{categories}"
                 f"{geo}"
-                f"URL: {event['url']}\n\n"
+                f"URL: {event.url}\n\n"
                 f"Description:\n{textwrap.fill(description, width=80)}\n\n"
                 f"{'-' * 80}\n\n"
             )
-        
-        return result
+
+        return "".join(parts)
     
     except Exception as e:
         return f"Error retrieving event details: {str(e)}"
@@ -496,7 +752,7 @@ async def list_categories() -> str:
         # Extract all categories
         all_categories = set()
         for event in all_events:
-            for category in event["categories"]:
+            for category in event.categories:
                 if category:  # Ensure non-empty
                     all_categories.add(category)
         
@@ -506,11 +762,11 @@ async def list_categories() -> str:
         # Sort categories alphabetically
         sorted_categories = sorted(all_categories)
         
-        result = "Available event categories:\n\n"
+        parts = ["Available event categories:\n\n"]
         for i, category in enumerate(sorted_categories, 1):
-            result += f"{i}. {category}\n"
-        
-        return result
+            parts.append(f"{i}. {category}\n")
+
+        return "".join(parts)
     
     except Exception as e:
         return f"Error listing categories: {str(e)}"